@@ -1,8 +1,9 @@
 import asyncio
 import aiohttp
+import os
+import time
 import uuid
 import random
-from datetime import datetime, timezone
 
 API_URL = "http://aggregator:8080/publish"
 TOPICS = ["user-activity", "system-log", "transaction", "security-event", "performance-metric"]
@@ -10,13 +11,22 @@ SOURCES = ["raspberry-pi", "iot-hub", "mobile-app"]
 
 TOTAL_EVENTS = 5000
 DUPLICATION_RATE = 0.2
-CONCURRENCY_LIMIT = 100 
+CONCURRENCY_LIMIT = 100
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", "50"))
+
+def _iso_utc_now(_strftime=time.strftime, _gmtime=time.gmtime, _time=time.time):
+    # ISO8601 UTC timestamp without allocating a datetime; default args
+    # bind the time functions once to skip global lookups
+    t = _time()
+    secs = int(t)
+    us = int((t - secs) * 1_000_000)
+    return f"{_strftime('%Y-%m-%dT%H:%M:%S', _gmtime(secs))}.{us:06d}Z"
 
 def generate_event(topic=None, source=None):
     return {
         "topic": topic or random.choice(TOPICS),
         "event_id": str(uuid.uuid4()),
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": _iso_utc_now(),
         "source": source or random.choice(SOURCES),
         "payload": {
             "value": random.randint(0, 100),
@@ -24,13 +34,13 @@ def generate_event(topic=None, source=None):
         }
     }
 
-async def send_event(session, event, sem, idx=None):
+async def send_batch(session, batch, sem, idx=None):
     async with sem:
         try:
-            async with session.post(API_URL, json=event) as resp:
+            async with session.post(API_URL, json=batch) as resp:
                 status = resp.status
                 if idx is not None:
-                    print(f"[SEND] #{idx+1} event_id={event['event_id']} topic={event['topic']} status={status}")
+                    print(f"[SEND] batch #{idx+1} size={len(batch)} status={status}")
                 if status == 200:
                     return "ok"
                 elif status == 409:
@@ -38,39 +48,95 @@ async def send_event(session, event, sem, idx=None):
                 else:
                     return f"error-{status}"
         except Exception as e:
-            print(f"[ERROR] event_id={event['event_id']} error={e}")
+            print(f"[ERROR] batch #{idx+1 if idx is not None else '?'} error={e}")
             return f"fail-{e}"
 
-async def wait_for_aggregator(url, timeout=60):
-    for _ in range(timeout):
+async def wait_for_aggregator(session, url, timeout=60):
+    # Monotonic deadlines: probe once per second and honor the overall
+    # timeout budget even when individual probes are slow, instead of
+    # drifting by (probe time + 1s) per attempt
+    deadline = time.monotonic() + timeout
+    next_probe = time.monotonic()
+    while time.monotonic() < deadline:
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as resp:
-                    if resp.status == 200:
-                        print("Aggregator is ready!")
-                        return
+            async with session.get(url) as resp:
+                if resp.status == 200:
+                    print("Aggregator is ready!")
+                    return
         except Exception:
             pass
         print("Waiting for aggregator to be ready...")
-        await asyncio.sleep(1)
+        next_probe += 1
+        delay = next_probe - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        else:
+            next_probe = time.monotonic()  # fell behind; reset anchor
     print("Aggregator not ready after waiting, proceeding anyway...")
 
 async def main():
-    await wait_for_aggregator("http://aggregator:8080/health")
+    # One long-lived session with keep-alive so the readiness probe and every
+    # POST reuse warm connections instead of paying a handshake per request
+    connector = aiohttp.TCPConnector(
+        limit=CONCURRENCY_LIMIT,
+        limit_per_host=CONCURRENCY_LIMIT,
+        keepalive_timeout=75,
+        enable_cleanup_closed=True,
+        # all 5000+ requests hit the same host; cache its DNS answer
+        use_dns_cache=True,
+        ttl_dns_cache=300
+    )
+    session = aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=10),
+        # the aggregator sets no cookies; skip cookie jar bookkeeping
+        cookie_jar=aiohttp.DummyCookieJar()
+    )
+
+    async with session:
+        await wait_for_aggregator(session, "http://aggregator:8080/health")
+
+        sem = asyncio.Semaphore(CONCURRENCY_LIMIT)
+
+        # Vectorize the random picks once instead of paying random.choice +
+        # datetime lookups per event; one timestamp is enough for a load batch
+        topics = random.choices(TOPICS, k=TOTAL_EVENTS)
+        sources = random.choices(SOURCES, k=TOTAL_EVENTS)
+        statuses = random.choices(["ok", "warn", "error"], k=TOTAL_EVENTS)
+        values = [random.randrange(0, 101) for _ in range(TOTAL_EVENTS)]
+        now_iso = _iso_utc_now()
 
-    sem = asyncio.Semaphore(CONCURRENCY_LIMIT)
+        events = [
+            {
+                "topic": t,
+                "event_id": str(uuid.uuid4()),
+                "timestamp": now_iso,
+                "source": s,
+                "payload": {"value": v, "status": st}
+            }
+            for t, s, st, v in zip(topics, sources, statuses, values)
+        ]
+        duplicates = random.sample(events, int(TOTAL_EVENTS * DUPLICATION_RATE))
+        all_events = events + duplicates
+        random.shuffle(all_events)
 
-    events = [generate_event() for _ in range(TOTAL_EVENTS)]
-    duplicates = random.sample(events, int(TOTAL_EVENTS * DUPLICATION_RATE))
-    all_events = events + duplicates
-    random.shuffle(all_events)
+        # The aggregator's /publish accepts a JSON list, so one round trip
+        # covers up to BATCH_SIZE events instead of one
+        batches = [
+            all_events[i:i + BATCH_SIZE]
+            for i in range(0, len(all_events), BATCH_SIZE)
+        ]
 
-    print(f"Sending {len(all_events)} events ({TOTAL_EVENTS} unique + {len(duplicates)} duplicates)...")
+        print(f"Sending {len(all_events)} events ({TOTAL_EVENTS} unique + {len(duplicates)} duplicates) in {len(batches)} batches...")
 
-    async with aiohttp.ClientSession() as session:
-        results = await asyncio.gather(
-            *(send_event(session, event, sem, idx) for idx, event in enumerate(all_events))
-        )
+        # TaskGroup has lower per-task overhead than gather and propagates
+        # errors cleanly (requires Python 3.11+)
+        async with asyncio.TaskGroup() as tg:
+            tasks = [
+                tg.create_task(send_batch(session, batch, sem, idx))
+                for idx, batch in enumerate(batches)
+            ]
+        results = [t.result() for t in tasks]
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
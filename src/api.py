@@ -2,12 +2,15 @@
 FastAPI application with REST endpoints.
 Provides API for publishing events and querying aggregated logs.
 """
+import asyncio
 import logging
+import time
 from datetime import datetime
-from typing import List, Union, Optional, Dict
+from typing import Optional
 
-from fastapi import FastAPI, Request, HTTPException, Query, Body
-from fastapi.responses import JSONResponse
+import orjson
+from fastapi import FastAPI, Request, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 
 from .models import (
     Event, PublishResponse, EventsResponse, 
@@ -19,6 +22,20 @@ from .dedup_store import DedupStore
 logger = logging.getLogger(__name__)
 
 
+# Healthcheck timestamp cached at one-second granularity; load balancers and
+# Docker healthchecks can hit /health several times a second and a
+# second-stale timestamp is fine for a liveness probe
+_HEALTH_CACHE = [0, ""]
+
+
+def _cached_now_z() -> str:
+    """Return the current UTC time as ISO8601 'Z' string, cached per second"""
+    t = int(time.time())
+    if t != _HEALTH_CACHE[0]:
+        _HEALTH_CACHE[:] = [t, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(t)) + "Z"]
+    return _HEALTH_CACHE[1]
+
+
 def create_app(consumer: Consumer, dedup_store: DedupStore, start_time: datetime) -> FastAPI:
     """
     Create and configure FastAPI application.
@@ -34,7 +51,8 @@ def create_app(consumer: Consumer, dedup_store: DedupStore, start_time: datetime
     app = FastAPI(
         title="UTS Log Aggregator",
         description="Pub-Sub Log Aggregator with Idempotent Consumer and Deduplication",
-        version="1.0.0"
+        version="1.0.0",
+        default_response_class=ORJSONResponse
     )
     
     @app.get("/", tags=["Root"])
@@ -53,45 +71,44 @@ def create_app(consumer: Consumer, dedup_store: DedupStore, start_time: datetime
         }
     
     @app.post("/publish", tags=["Events"])
-    async def publish_event(request: Request, events: Union[Dict, List[Dict]] = Body(...)):
+    async def publish_event(request: Request):
         """
         Publish single event or batch of events to the aggregator.
         
         Events are queued for asynchronous processing by the idempotent consumer.
-        Duplicate events (same topic + event_id) will be automatically deduplicated.
-        
+        Validation and deduplication happen on the consumer side, off the
+        request path; duplicates surface via /stats.
+
+        The body is parsed with orjson directly instead of going through
+        FastAPI's stdlib-json body handling.
+
         Args:
-            request: FastAPI request object
-            events: Single Event or list of Events in dictionary form
-            
+            request: FastAPI request object (body: single Event or list of
+                Events in dictionary form)
+
         Returns:
             JSON response with status and count of queued events
         """
         try:
             consumer = getattr(request.app.state, "consumer", None)
-            dedup_store = getattr(request.app.state, "dedup_store", None)
-            if consumer is None or dedup_store is None:
+            if consumer is None:
                 raise HTTPException(status_code=503, detail="Service not ready")
 
-            batch = events if isinstance(events, list) else [events]
-            event_objs = []
-            duplicate_count = 0
+            raw = await request.body()
+            payload = orjson.loads(raw)
+            batch = payload if isinstance(payload, list) else [payload]
             for ev in batch:
-                event_obj = Event(**ev)
-                # Cek duplikat sebelum masuk queue
-                if dedup_store.is_duplicate(event_obj):
-                    duplicate_count += 1
-                    continue
-                await consumer.queue.put(event_obj)
-                event_objs.append(event_obj)
+                # from_dict skips Pydantic validation; the consumer
+                # validates before storing
+                event_obj = Event.from_dict(ev)
+                # Fast path: avoid a scheduler yield per event while the
+                # queue has capacity (mirrors get_nowait in the consumer)
+                try:
+                    consumer.queue.put_nowait(event_obj)
+                except asyncio.QueueFull:
+                    await consumer.queue.put(event_obj)
 
-            if duplicate_count == len(batch):
-                # Semua event duplikat
-                return JSONResponse(status_code=409, content={"detail": "Duplicate event(s) detected"})
-            elif duplicate_count > 0:
-                return {"status": "queued", "queued_count": len(event_objs), "duplicate_count": duplicate_count}
-            else:
-                return {"status": "queued", "queued_count": len(event_objs)}
+            return {"status": "queued", "queued_count": len(batch)}
 
         except HTTPException:
             raise
@@ -99,7 +116,7 @@ def create_app(consumer: Consumer, dedup_store: DedupStore, start_time: datetime
             logger.error("Error in publish endpoint: %s", e, exc_info=True)
             raise HTTPException(status_code=500, detail=f"Failed to queue events: {e}")
     
-    @app.get("/events", response_model=EventsResponse, tags=["Events"])
+    @app.get("/events", tags=["Events"])
     async def get_events(
         request: Request, 
         topic: Optional[str] = Query(None, description="Filter by topic"),
@@ -113,7 +130,7 @@ def create_app(consumer: Consumer, dedup_store: DedupStore, start_time: datetime
             - limit: Maximum number of events to return (1-1000, default 100)
             
         Returns:
-            EventsResponse with list of processed events
+            JSON response with list of processed events (EventsResponse shape)
         """
         try:
             dedup_store = getattr(request.app.state, "dedup_store", None)
@@ -121,16 +138,19 @@ def create_app(consumer: Consumer, dedup_store: DedupStore, start_time: datetime
                 raise HTTPException(status_code=503, detail="Service not ready: dedup_store not initialized")
             
             events = await asyncio.to_thread(
-                dedup_store.get_events,
+                dedup_store.get_events_raw,
                 topic=topic,
                 limit=limit
             )
             
-            return EventsResponse(
-                events=events,
-                total=len(events),
-                filtered_by_topic=topic
-            )
+            # rows are plain dicts from our own store; serialize them with
+            # orjson directly instead of building Pydantic models that
+            # FastAPI would immediately dump back out
+            return ORJSONResponse({
+                "events": events,
+                "total": len(events),
+                "filtered_by_topic": topic
+            })
             
         except Exception as e:
             logger.error("Error in get_events endpoint: %s", e, exc_info=True)
@@ -155,7 +175,7 @@ def create_app(consumer: Consumer, dedup_store: DedupStore, start_time: datetime
             if dedup_store is None:
                 raise HTTPException(status_code=503, detail="Service not ready: dedup_store not initialized")
             
-            stats = dedup_store.get_stats()
+            stats = await asyncio.to_thread(dedup_store.get_stats)
             stats["uptime"] = str(datetime.utcnow() - request.app.state.start_time)
             
             return stats
@@ -174,10 +194,7 @@ def create_app(consumer: Consumer, dedup_store: DedupStore, start_time: datetime
         """
         return HealthResponse(
             status="healthy",
-            timestamp=datetime.utcnow().isoformat() + 'Z'
+            timestamp=_cached_now_z()
         )
     
-    
-    import asyncio
-    
     return app
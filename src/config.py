@@ -3,32 +3,41 @@ Configuration module for the log aggregator service.
 Handles environment variables and application settings.
 """
 import os
+from dataclasses import dataclass, field
 from pathlib import Path
 
-class Config:
-    """Application configuration"""
-    
-    
-    APP_NAME = "UTS Log Aggregator"
-    APP_VERSION = "1.0.0"
-    HOST = os.getenv("HOST", "0.0.0.0")
-    PORT = int(os.getenv("PORT", "8080"))
-    
-    
-    DATA_DIR = Path(os.getenv("DATA_DIR", "./data"))
-    DB_PATH = DATA_DIR / "dedup_store.db"
-    
-    
-    QUEUE_MAX_SIZE = int(os.getenv("QUEUE_MAX_SIZE", "10000"))
-    
-    
-    CONSUMER_BATCH_SIZE = int(os.getenv("CONSUMER_BATCH_SIZE", "100"))
-    CONSUMER_SLEEP_INTERVAL = float(os.getenv("CONSUMER_SLEEP_INTERVAL", "0.01"))
-    
-    
-    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-    
-    @classmethod
-    def ensure_data_dir(cls):
+
+@dataclass(slots=True)
+class _Config:
+    """
+    Application configuration singleton.
+
+    Environment variables are read once at import time; slots make every
+    attribute read a fixed-offset lookup instead of a dict lookup. Not
+    frozen because tests override DATA_DIR/DB_PATH at runtime.
+    """
+
+    APP_NAME: str = "UTS Log Aggregator"
+    APP_VERSION: str = "1.0.0"
+    HOST: str = os.getenv("HOST", "0.0.0.0")
+    PORT: int = int(os.getenv("PORT", "8080"))
+
+    DATA_DIR: Path = field(default_factory=lambda: Path(os.getenv("DATA_DIR", "./data")))
+    DB_PATH: Path = field(init=False)
+
+    QUEUE_MAX_SIZE: int = int(os.getenv("QUEUE_MAX_SIZE", "10000"))
+
+    CONSUMER_BATCH_SIZE: int = int(os.getenv("CONSUMER_BATCH_SIZE", "100"))
+    CONSUMER_SLEEP_INTERVAL: float = float(os.getenv("CONSUMER_SLEEP_INTERVAL", "0.01"))
+
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+
+    def __post_init__(self):
+        self.DB_PATH = self.DATA_DIR / "dedup_store.db"
+
+    def ensure_data_dir(self):
         """Ensure data directory exists"""
-        cls.DATA_DIR.mkdir(parents=True, exist_ok=True)
+        self.DATA_DIR.mkdir(parents=True, exist_ok=True)
+
+
+Config = _Config()
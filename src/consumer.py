@@ -44,11 +44,23 @@ class Consumer:
         self._task: Optional[asyncio.Task] = None
         
         
-        self.stats = {
-            'received': 0,
-            'unique_processed': 0,
-            'duplicate_dropped': 0
-        }
+        # Plain int attributes rather than a stats dict: the hot batch loop
+        # increments these per event, and attribute access skips the dict
+        # hashing a mapping would pay; get_stats() builds the dict shape
+        self._received = 0
+        self._unique = 0
+        self._dropped = 0
+        
+        # Signalled whenever the received count reaches the target set by
+        # wait_for(); lets tests and callers block on actual progress
+        # instead of sleeping a fixed interval
+        self._drained = asyncio.Event()
+        self._target_received = 0
+
+        # Set while the queue is empty and no batch is in flight; drain()
+        # blocks on it so callers wake the moment the consumer goes idle
+        self._idle = asyncio.Event()
+        self._idle.set()
     
     async def start(self):
         """Start the consumer task"""
@@ -60,6 +72,45 @@ class Consumer:
         self._task = asyncio.create_task(self._consume_loop())
         logger.info("Consumer started")
     
+    async def wait_for(self, n: int, timeout: float = 2.0):
+        """
+        Wait until the consumer has received at least n events.
+
+        Event-driven replacement for fixed sleeps: the consume loop sets
+        the event as soon as the count is reached, so callers wake
+        immediately instead of over-waiting.
+
+        Args:
+            n: Received-event count to wait for
+            timeout: Maximum seconds to wait
+        """
+        self._target_received = n
+        self._drained.clear()
+        if self._received >= n:
+            return
+        await asyncio.wait_for(self._drained.wait(), timeout)
+
+    async def drain(self, timeout: float = 2.0):
+        """
+        Wait until the queue is empty and no batch is in flight.
+
+        Event-driven replacement for trailing fixed sleeps: the consume
+        loop sets the idle event as soon as it has stored the last batch,
+        so callers wake immediately instead of over-waiting.
+
+        Args:
+            timeout: Maximum seconds to wait
+        """
+        async def _until_idle():
+            # check-and-clear runs without an await in between, so the
+            # consume loop (same event loop) cannot interleave here
+            while not (self.queue.empty() and self._idle.is_set()):
+                if not self.queue.empty():
+                    self._idle.clear()
+                await self._idle.wait()
+
+        await asyncio.wait_for(_until_idle(), timeout)
+
     async def stop(self):
         """Stop the consumer and wait for graceful shutdown"""
         if not self.running:
@@ -77,28 +128,63 @@ class Consumer:
         
         while self.running or not self.queue.empty():
             try:
-                
-                batch = []
-                
-                
-                for _ in range(self.batch_size):
-                    try:
-                        event = self.queue.get_nowait()
-                        batch.append(event)
-                    except asyncio.QueueEmpty:
-                        break
-                
-                if batch:
+                # Block on the first event instead of polling with a sleep;
+                # the short timeout keeps shutdown responsive when idle
+                try:
+                    first = await asyncio.wait_for(self.queue.get(), timeout=0.5)
+                except asyncio.TimeoutError:
+                    self._idle.set()
+                    continue
+
+                self._idle.clear()
+                batch = [first]
+                batch.extend(self._drain_nowait(self.batch_size - 1))
+
+                try:
                     await self._process_batch(batch)
-                else:
-                    
-                    await asyncio.sleep(self.sleep_interval)
-                    
+                finally:
+                    # keep queue.join() accurate even if processing failed
+                    for _ in batch:
+                        self.queue.task_done()
+                    if self.queue.empty():
+                        self._idle.set()
+
             except Exception as e:
                 logger.error(f"Error in consumer loop: {e}", exc_info=True)
                 await asyncio.sleep(self.sleep_interval)
-        
+
         logger.info("Consumer loop finished")
+
+    def _drain_nowait(self, limit: Optional[int] = None) -> list:
+        """
+        Grab up to limit (default batch_size) events without awaiting.
+
+        Steals directly from the queue's underlying deque so batch assembly
+        is a C-level popleft per event instead of a get_nowait call with its
+        method dispatch and try/except. Falls back to get_nowait if the
+        asyncio.Queue internals ever change.
+        """
+        if limit is None:
+            limit = self.batch_size
+        try:
+            dq = self.queue._queue  # internal collections.deque
+            wakeup = self.queue._wakeup_next
+            putters = self.queue._putters
+        except AttributeError:
+            batch = []
+            for _ in range(limit):
+                try:
+                    batch.append(self.queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            return batch
+
+        n = min(len(dq), limit)
+        batch = [dq.popleft() for _ in range(n)]
+        if n:
+            # notify any waiting put() that space is available
+            wakeup(putters)
+        return batch
     
     async def _process_batch(self, events: list[Event]):
         """
@@ -107,33 +193,64 @@ class Consumer:
         Args:
             events: List of events to process
         """
-        # Process events synchronously in batch for better performance
+        # Validate here rather than on the request path; publish enqueues
+        # unvalidated model_construct proxies
+        validated = []
         for event in events:
+            self._received += 1
             try:
-                self.stats['received'] += 1
-                
-                # Direct synchronous call for better performance in tight loop
-                is_new = self.dedup_store.store_event(event)
-                
-                if is_new:
-                    self.stats['unique_processed'] += 1
-                    logger.debug(
-                        f"Processed new event: {event.get_dedup_key()} "
-                        f"from topic '{event.topic}'"
-                    )
-                else:
-                    self.stats['duplicate_dropped'] += 1
-                    logger.info(
-                        f"Dropped duplicate event: {event.get_dedup_key()} "
-                        f"from topic '{event.topic}'"
-                    )
-                    
+                validated.append(Event.model_validate(event.__dict__))
             except Exception as e:
+                # event may be an unvalidated proxy missing fields, so avoid
+                # get_dedup_key() here
                 logger.error(
-                    f"Error processing event {event.get_dedup_key()}: {e}",
+                    f"Error processing event {getattr(event, 'event_id', '<invalid>')}: {e}",
                     exc_info=True
                 )
-    
+
+        if not validated:
+            self._maybe_signal_drained()
+            return
+
+        try:
+            # Single SQLite transaction per batch, run off the event loop so
+            # /publish and /events don't stall behind the inserts
+            results = await asyncio.to_thread(
+                self.dedup_store.store_events_batch, validated
+            )
+        except Exception as e:
+            logger.error(f"Error storing event batch: {e}", exc_info=True)
+            self._maybe_signal_drained()
+            return
+
+        for event, is_new in zip(validated, results):
+            if is_new:
+                self._unique += 1
+                # guard so get_dedup_key/formatting only run when the
+                # level is actually enabled
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "Processed new event: %s from topic '%s'",
+                        event.get_dedup_key(), event.topic
+                    )
+            else:
+                self._dropped += 1
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "Dropped duplicate event: %s from topic '%s'",
+                        event.get_dedup_key(), event.topic
+                    )
+
+        # signal only once the batch is fully stored, so a wait_for return
+        # means the store reflects those events, not just that they were
+        # pulled off the queue
+        self._maybe_signal_drained()
+
+    def _maybe_signal_drained(self):
+        """Set the drained event if the received target has been reached"""
+        if self._received >= self._target_received:
+            self._drained.set()
+
     async def _process_event(self, event: Event):
         """
         Process a single event (idempotent operation).
@@ -142,19 +259,19 @@ class Consumer:
             event: Event to process
         """
         try:
-            self.stats['received'] += 1
+            self._received += 1
             
             # Direct synchronous call
             is_new = self.dedup_store.store_event(event)
             
             if is_new:
-                self.stats['unique_processed'] += 1
+                self._unique += 1
                 logger.debug(
                     f"Processed new event: {event.get_dedup_key()} "
                     f"from topic '{event.topic}'"
                 )
             else:
-                self.stats['duplicate_dropped'] += 1
+                self._dropped += 1
                 logger.info(
                     f"Dropped duplicate event: {event.get_dedup_key()} "
                     f"from topic '{event.topic}'"
@@ -168,12 +285,14 @@ class Consumer:
     
     def get_stats(self) -> dict:
         """Get consumer statistics"""
-        return self.stats.copy()
+        return {
+            'received': self._received,
+            'unique_processed': self._unique,
+            'duplicate_dropped': self._dropped
+        }
     
     def reset_stats(self):
         """Reset consumer statistics"""
-        self.stats = {
-            'received': 0,
-            'unique_processed': 0,
-            'duplicate_dropped': 0
-        }
+        self._received = 0
+        self._unique = 0
+        self._dropped = 0
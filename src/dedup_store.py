@@ -2,17 +2,162 @@
 Deduplication store implementation using SQLite.
 Provides persistent, atomic storage for tracking processed events.
 """
+import hashlib
+import math
+import msgpack
+import orjson
+import queue
 import sqlite3
+import struct
+import threading
+import time
 import logging
 from pathlib import Path
 from typing import Optional, List, Tuple
 from datetime import datetime
 from contextlib import contextmanager
+from functools import lru_cache
 
 from .models import Event, ProcessedEvent
 
 logger = logging.getLogger(__name__)
 
+# INSERT ... RETURNING (SQLite 3.35+) both inserts and signals
+# duplicate-vs-new in a single statement
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+def _ns_to_iso(ns: int) -> str:
+    """Render an epoch-nanosecond processed_at as the API's ISO8601 string"""
+    return datetime.utcfromtimestamp(ns / 1e9).isoformat() + 'Z'
+
+
+def _iso_to_ns(value: str) -> int:
+    """Parse a legacy ISO8601 processed_at into epoch nanoseconds"""
+    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return int(dt.timestamp() * 1e9)
+
+
+# Hot-path SQL as module-level constants: sqlite3's per-connection statement
+# cache only hits when the exact same string object/text is reused
+_SQL_INSERT_RETURNING = """
+    INSERT INTO processed_events
+    (dedup_hash, topic, event_id, timestamp, source, payload, processed_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(dedup_hash) DO NOTHING
+    RETURNING dedup_hash
+"""
+
+_SQL_INSERT_IGNORE = """
+    INSERT OR IGNORE INTO processed_events
+    (dedup_hash, topic, event_id, timestamp, source, payload, processed_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_EXISTS = """
+    SELECT EXISTS(
+        SELECT 1 FROM processed_events
+        WHERE dedup_hash = ?
+        LIMIT 1
+    ) as is_dup
+"""
+
+# Probing a batch needs a placeholder list sized to the batch; memoize the
+# generated SQL so sqlite3's statement cache still hits for common sizes
+@lru_cache(maxsize=8)
+def _sql_probe_hashes(n: int) -> str:
+    return (
+        "SELECT dedup_hash FROM processed_events WHERE dedup_hash IN ("
+        + ",".join("?" * n) + ")"
+    )
+
+
+_SQL_SELECT_BY_TOPIC = """
+    SELECT topic, event_id, timestamp, source, payload, processed_at
+    FROM processed_events
+    WHERE topic = ?
+    ORDER BY processed_at DESC
+    LIMIT ?
+"""
+
+_SQL_SELECT_ALL = """
+    SELECT topic, event_id, timestamp, source, payload, processed_at
+    FROM processed_events
+    ORDER BY processed_at DESC
+    LIMIT ?
+"""
+
+
+class _BloomFilter:
+    """
+    In-memory Bloom filter fronting the SQLite duplicate check.
+
+    Most incoming events are unique, so a "definitely absent" answer here
+    lets the hot path skip the SELECT entirely. Uses double hashing over a
+    single blake2b digest to synthesize k probe indices; no false
+    negatives, and false positives just fall through to SQLite.
+    """
+
+    def __init__(self, expected_items: int = 100_000, fp_rate: float = 1e-4):
+        # classic sizing: m = -n ln p / (ln 2)^2, k = (m/n) ln 2
+        m = int(-expected_items * math.log(fp_rate) / (math.log(2) ** 2))
+        self.num_bits = max(64, m)
+        self.num_hashes = max(1, round(self.num_bits / expected_items * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _indices(self, key: bytes):
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        m = self.num_bits
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def add(self, key: bytes) -> bool:
+        """
+        Set the key's bits; returns True if the key was definitely new.
+
+        Most keys are unique, so the first unset bit proves newness and the
+        remaining bits are set in a tight branch-free loop instead of being
+        tested one by one.
+        """
+        bits = self.bits
+        indices = self._indices(key)
+        for pos, idx in enumerate(indices):
+            if not (bits[idx >> 3] >> (idx & 7)) & 1:
+                for rest in indices[pos:]:
+                    bits[rest >> 3] |= 1 << (rest & 7)
+                return True
+        return False
+
+    def __contains__(self, key: bytes) -> bool:
+        bits = self.bits
+        for idx in self._indices(key):
+            if not (bits[idx >> 3] >> (idx & 7)) & 1:
+                return False
+        return True
+
+    def save(self, path: Path):
+        """Persist the bit array alongside the database file"""
+        with open(path, "wb") as f:
+            f.write(struct.pack("<QQ", self.num_bits, self.num_hashes))
+            f.write(self.bits)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["_BloomFilter"]:
+        """Load a persisted filter; returns None if missing or incompatible"""
+        try:
+            with open(path, "rb") as f:
+                num_bits, num_hashes = struct.unpack("<QQ", f.read(16))
+                bits = bytearray(f.read())
+        except (OSError, struct.error):
+            return None
+        bloom = cls.__new__(cls)
+        bloom.num_bits = num_bits
+        bloom.num_hashes = num_hashes
+        bloom.bits = bits
+        if len(bits) != (num_bits + 7) // 8:
+            return None
+        return bloom
+
 
 class DedupStore:
     """
@@ -22,14 +167,21 @@ class DedupStore:
     Stores processed events with their metadata to prevent reprocessing.
     """
     
-    def __init__(self, db_path: Path):
+    def __init__(self, db_path: Path, synchronous: str = "NORMAL"):
         """
         Initialize the dedup store.
         
         Args:
-            db_path: Path to the SQLite database file
+            db_path: Path to the SQLite database file, or ":memory:"
+            synchronous: SQLite synchronous level ("NORMAL" is safe with
+                WAL; throughput-only workloads such as perf tests may pass
+                "OFF" to skip fsyncs entirely)
         """
         self.db_path = db_path
+        self._synchronous = synchronous
+        # in-memory databases (tests) skip the durability machinery:
+        # no WAL, no bloom sidecar, no read-only pool
+        self._is_memory = str(db_path) == ":memory:"
         
         # Statistics counters
         self.received_count = 0
@@ -37,43 +189,101 @@ class DedupStore:
         self.duplicate_count = 0
         self.topics = set()
         
-        # Batch processing optimization
-        self._batch_events = []
+        # Group-commit optimization: inserts run immediately (callers need
+        # the is_new result) but COMMITs are deferred and amortized
+        self._pending_writes = 0
         self._batch_size = 50  # Commit every 50 events
         
+        # Writes run off the event loop (asyncio.to_thread); one lock keeps
+        # transactions on the shared writer connection from interleaving
+        self._write_lock = threading.Lock()
+
         # Keep a persistent connection for better performance
         self._conn = None
-        
+        # Pool of read-only connections so concurrent query endpoints don't
+        # serialize on one handle (or contend with the writer under WAL)
+        self._read_pool = None
+        self._read_pool_size = 3
+
         self._init_db()
+        self._load_stats()
+
+        # Build the reader pool eagerly: _get_read_connection runs on
+        # concurrent to_thread workers, and a lazy, unsynchronized build
+        # there could race two threads into separate pools (leaking the
+        # loser's handles and overfilling the bounded queue on check-in).
+        # The DB file exists once _init_db returns, so open readers now.
+        if not self._is_memory:
+            try:
+                pool = queue.Queue(maxsize=self._read_pool_size)
+                for _ in range(self._read_pool_size):
+                    pool.put(self._open_read_connection())
+                self._read_pool = pool
+            except sqlite3.Error as e:
+                logger.warning(
+                    "Read-only pool unavailable, queries fall back to the "
+                    "writer connection: %s", e
+                )
+
+        # Bloom filter short-circuits negative duplicate lookups; persisted
+        # next to the DB file and rebuilt from existing rows when missing
+        self._bloom_path = None if self._is_memory else Path(str(db_path) + ".bloom")
+        self._bloom = _BloomFilter.load(self._bloom_path) if self._bloom_path else None
+        if self._bloom is None:
+            self._bloom = _BloomFilter()
+            self._rebuild_bloom()
+
         logger.info(f"DedupStore initialized at {db_path}")
     
     def _init_db(self):
         """Initialize database schema with proper indexes"""
         with self._get_connection() as conn:
-            # Enable WAL mode for better concurrency
-            conn.execute("PRAGMA journal_mode=WAL")
-            # NORMAL is faster than FULL, still safe with WAL
-            conn.execute("PRAGMA synchronous=NORMAL")
+            if self._is_memory:
+                # nothing to sync or journal for a throwaway in-memory DB
+                conn.execute("PRAGMA journal_mode=MEMORY")
+                conn.execute("PRAGMA synchronous=OFF")
+            else:
+                # 8K pages match typical event row sizes better than the 4K
+                # default; only takes effect while the DB is still empty
+                conn.execute("PRAGMA page_size=8192")
+                # Enable WAL mode for better concurrency
+                conn.execute("PRAGMA journal_mode=WAL")
+                # NORMAL is faster than FULL, still safe with WAL
+                conn.execute(f"PRAGMA synchronous={self._synchronous}")
+                # Memory-map DB pages (256 MiB) so page reads are user-space
+                # loads instead of read() syscalls
+                conn.execute("PRAGMA mmap_size=268435456")
+                # Checkpointing is driven by the application's background task
+                # (see main.Application) so no COMMIT ever pays for one inline
+                conn.execute("PRAGMA wal_autocheckpoint=0")
+                # Cap how much WAL file the truncating checkpoint keeps around
+                # so sequential WAL appends stay within a warm file region
+                conn.execute("PRAGMA journal_size_limit=67108864")
             # Increase cache size for better performance (10MB)
             conn.execute("PRAGMA cache_size=-10000")
             # Store temp tables in memory
             conn.execute("PRAGMA temp_store=MEMORY")
-            # Optimize for write-heavy workload
-            conn.execute("PRAGMA locking_mode=EXCLUSIVE")
             
             
+            self._migrate_legacy_schema(conn)
+
+            # Fixed-width 16-byte hash PK: smaller, faster-to-compare index
+            # than a UNIQUE over two variable-length TEXT columns, and
+            # WITHOUT ROWID stores the row inline with the key so a PK
+            # lookup touches one B-tree
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS processed_events (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    dedup_hash BLOB PRIMARY KEY,
                     topic TEXT NOT NULL,
                     event_id TEXT NOT NULL,
                     timestamp TEXT NOT NULL,
                     source TEXT NOT NULL,
-                    payload TEXT NOT NULL,
-                    processed_at TEXT NOT NULL,
-                    UNIQUE(topic, event_id)
-                )
+                    payload BLOB NOT NULL,
+                    processed_at INTEGER NOT NULL
+                ) WITHOUT ROWID
             """)
+
+            self._convert_text_payloads(conn)
             
             
             conn.execute("""
@@ -82,23 +292,148 @@ class DedupStore:
             """)
             
             conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_event_id 
-                ON processed_events(event_id)
+                CREATE INDEX IF NOT EXISTS idx_processed_at 
+                ON processed_events(processed_at)
             """)
             
+            # lifetime counters (received/duplicates) persisted across
+            # restarts so /stats can be served from memory
             conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_processed_at 
-                ON processed_events(processed_at)
+                CREATE TABLE IF NOT EXISTS stats (
+                    key TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
             """)
             
             conn.commit()
             logger.info("Database schema initialized")
+
+    def _migrate_legacy_schema(self, conn):
+        """
+        One-shot migration from the old AUTOINCREMENT/UNIQUE(topic,event_id)
+        layout to the hash-keyed WITHOUT ROWID table.
+        """
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(processed_events)")]
+        if not columns or "dedup_hash" in columns:
+            return
+
+        logger.info("Migrating processed_events to hash-keyed schema")
+        conn.execute("ALTER TABLE processed_events RENAME TO processed_events_legacy")
+        conn.execute("""
+            CREATE TABLE processed_events (
+                dedup_hash BLOB PRIMARY KEY,
+                topic TEXT NOT NULL,
+                event_id TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                source TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                processed_at INTEGER NOT NULL
+            ) WITHOUT ROWID
+        """)
+        blake2b = hashlib.blake2b
+        rows = conn.execute("""
+            SELECT topic, event_id, timestamp, source, payload, processed_at
+            FROM processed_events_legacy
+        """)
+        conn.executemany(
+            "INSERT OR IGNORE INTO processed_events VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    blake2b(
+                        row[0].encode() + b"\x1f" + row[1].encode(),
+                        digest_size=16
+                    ).digest(),
+                    row[0], row[1], row[2], row[3], row[4],
+                    _iso_to_ns(row[5])
+                )
+                for row in rows.fetchall()
+            )
+        )
+        conn.execute("DROP TABLE processed_events_legacy")
+        conn.commit()
+
+    def _convert_text_payloads(self, conn):
+        """One-shot conversion of legacy JSON-text payloads to msgpack BLOBs"""
+        row = conn.execute("SELECT typeof(processed_at) FROM processed_events LIMIT 1").fetchone()
+        if row is not None and row[0] == "text":
+            logger.info("Converting processed_at column from ISO text to epoch ns")
+            rows = conn.execute(
+                "SELECT dedup_hash, processed_at FROM processed_events"
+            ).fetchall()
+            conn.executemany(
+                "UPDATE processed_events SET processed_at = ? WHERE dedup_hash = ?",
+                ((_iso_to_ns(value), dedup_hash) for dedup_hash, value in rows)
+            )
+            conn.commit()
+
+        row = conn.execute("SELECT typeof(payload) FROM processed_events LIMIT 1").fetchone()
+        if row is None or row[0] == "blob":
+            return
+
+        logger.info("Converting payload column from JSON text to msgpack")
+        rows = conn.execute("SELECT dedup_hash, payload FROM processed_events").fetchall()
+        conn.executemany(
+            "UPDATE processed_events SET payload = ? WHERE dedup_hash = ?",
+            (
+                (msgpack.packb(orjson.loads(payload), use_bin_type=True), dedup_hash)
+                for dedup_hash, payload in rows
+            )
+        )
+        conn.commit()
     
+    def _load_stats(self):
+        """
+        Seed the in-memory stats counters so get_stats never hits the DB.
+
+        unique_count and topics come from one scan each at startup; the
+        lifetime received/duplicate counters are reloaded from the stats
+        table (best effort - a crash loses at most the counters, never
+        events).
+        """
+        with self._get_connection() as conn:
+            cursor = conn.execute("SELECT COUNT(*) FROM processed_events")
+            self.unique_count = cursor.fetchone()[0]
+            cursor = conn.execute("SELECT DISTINCT topic FROM processed_events")
+            self.topics = {row[0] for row in cursor}
+            saved = dict(conn.execute("SELECT key, value FROM stats"))
+        self.received_count = saved.get("received", self.unique_count)
+        self.duplicate_count = saved.get("duplicate_dropped", 0)
+
+    def _persist_stats(self):
+        """Write the lifetime counters to the stats table"""
+        with self._write_lock, self._get_connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO stats (key, value) VALUES (?, ?)",
+                [
+                    ("received", self.received_count),
+                    ("duplicate_dropped", self.duplicate_count),
+                ]
+            )
+            conn.commit()
+            self._pending_writes = 0
+
+    def _rebuild_bloom(self):
+        """Repopulate the Bloom filter from the processed_events table"""
+        with self._get_connection() as conn:
+            cursor = conn.execute("SELECT dedup_hash FROM processed_events")
+            add = self._bloom.add
+            for row in cursor:
+                add(row['dedup_hash'])
+
     @contextmanager
     def _get_connection(self):
         """Context manager for database connections with connection reuse"""
         if self._conn is None:
-            self._conn = sqlite3.connect(str(self.db_path), timeout=10.0, check_same_thread=False)
+            # autocommit mode: no hidden BEGIN/COMMIT around every DML
+            # statement; transactions are opened explicitly by the write
+            # paths and closed by commit()/flush()
+            self._conn = sqlite3.connect(
+                str(self.db_path),
+                timeout=10.0,
+                check_same_thread=False,
+                cached_statements=256,
+                isolation_level=None
+            )
             self._conn.row_factory = sqlite3.Row
             # Additional performance optimizations
             self._conn.execute("PRAGMA cache_size=-10000")
@@ -110,28 +445,87 @@ class DedupStore:
             if self._conn:
                 self._conn.rollback()
             raise
-    
+
+    def _open_read_connection(self):
+        """Open one read-only connection for the reader pool"""
+        conn = sqlite3.connect(
+            f"file:{self.db_path}?mode=ro",
+            uri=True,
+            timeout=0.1,
+            check_same_thread=False,
+            cached_statements=256
+        )
+        conn.row_factory = sqlite3.Row
+        # fail fast on lock contention; WAL readers don't block, so a lock
+        # error here means we should fall back to the writer
+        conn.execute("PRAGMA busy_timeout=100")
+        return conn
+
+    @contextmanager
+    def _get_read_connection(self):
+        """
+        Context manager yielding a read-only connection for queries.
+
+        Checks a small pool of readers out and back in, so concurrent
+        /events and /stats calls each get their own handle and never
+        serialize on the writer's mutex under WAL. Falls back to the
+        writer connection when the read-only path fails.
+        """
+        if self._is_memory or self._read_pool is None:
+            # a read-only URI open of :memory: would be a different, empty
+            # database, and a missing pool means read-only opens failed at
+            # init; either way just use the writer
+            with self._get_connection() as conn:
+                yield conn
+            return
+
+        rconn = self._read_pool.get()
+
+        try:
+            # cheap probe so lock errors surface here instead of mid-query
+            rconn.execute("SELECT 1 FROM processed_events LIMIT 1").fetchone()
+        except sqlite3.Error:
+            self._read_pool.put(rconn)
+            with self._get_connection() as conn:
+                yield conn
+            return
+
+        try:
+            yield rconn
+        finally:
+            self._read_pool.put(rconn)
+
     def is_duplicate(self, event: Event) -> bool:
         """
         Check if an event has already been processed.
         Updates duplicate count if event is a duplicate.
         """
+        # Bloom filter: "absent" is authoritative, so skip SQLite entirely
+        # for the common unique-event case
+        if event.dedup_digest not in self._bloom:
+            return False
+
         with self._get_connection() as conn:
             # Use EXISTS for better performance (stops at first match)
-            cursor = conn.execute(
-                """SELECT EXISTS(
-                    SELECT 1 FROM processed_events 
-                    WHERE topic = ? AND event_id = ? 
-                    LIMIT 1
-                ) as is_dup""",
-                (event.topic, event.event_id)
-            )
+            cursor = conn.execute(_SQL_EXISTS, (event.dedup_digest,))
             result = cursor.fetchone()
             if result['is_dup']:
                 self.duplicate_count += 1
                 return True
             return False
     
+    def _insert_event(self, conn, params) -> bool:
+        """
+        Insert one event row; returns True if the row was new.
+
+        Uses INSERT ... ON CONFLICT DO NOTHING RETURNING where available so
+        one statement both inserts and reports duplicate-vs-new, instead of
+        INSERT OR IGNORE plus a rowcount probe.
+        """
+        if _HAS_RETURNING:
+            return conn.execute(_SQL_INSERT_RETURNING, params).fetchone() is not None
+        return conn.execute(_SQL_INSERT_IGNORE, params).rowcount > 0
+
     def store_event(self, event: Event) -> bool:
         """
         Store an event in the dedup store (idempotent operation).
@@ -142,31 +536,29 @@ class DedupStore:
         Returns:
             True if event was newly stored, False if it was a duplicate
         """
-        processed_at = datetime.utcnow().isoformat() + 'Z'
+        processed_at = time.time_ns()
         self.received_count += 1
         self.topics.add(event.topic)
         try:
-            with self._get_connection() as conn:
-                import json
-                # Use INSERT OR IGNORE for better performance
-                cursor = conn.execute(
-                    """
-                    INSERT OR IGNORE INTO processed_events 
-                    (topic, event_id, timestamp, source, payload, processed_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        event.topic,
-                        event.event_id,
-                        event.timestamp,
-                        event.source,
-                        json.dumps(event.payload),
-                        processed_at
-                    )
-                )
-                # Check if row was actually inserted
-                if cursor.rowcount > 0:
-                    conn.commit()
+            with self._write_lock, self._get_connection() as conn:
+                if not conn.in_transaction:
+                    conn.execute("BEGIN")
+                is_new = self._insert_event(conn, (
+                    event.dedup_digest,
+                    event.topic,
+                    event.event_id,
+                    event.timestamp,
+                    event.source,
+                    event.payload_blob,
+                    processed_at
+                ))
+                if is_new:
+                    # defer the commit; one fsync covers up to _batch_size rows
+                    self._pending_writes += 1
+                    if self._pending_writes >= self._batch_size:
+                        conn.commit()
+                        self._pending_writes = 0
+                    self._bloom.add(event.dedup_digest)
                     logger.debug(f"Stored new event: {event.get_dedup_key()}")
                     self.unique_count += 1
                     return True
@@ -180,6 +572,126 @@ class DedupStore:
             self.duplicate_count += 1
             return False
     
+    def store_events_batch(self, events: List[Event]) -> List[bool]:
+        """
+        Store a batch of events inside a single transaction.
+
+        Commits once per batch instead of once per event, so the WAL fsync
+        cost is amortized across the whole batch.
+
+        Args:
+            events: Events to store
+
+        Returns:
+            List of is_new flags aligned with the input events
+        """
+        processed_at = time.time_ns()
+        with self._write_lock, self._get_connection() as conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            known = self._probe_known_hashes(
+                conn, [event.dedup_digest for event in events]
+            )
+
+            results = []
+            rows = []
+            for event in events:
+                self.received_count += 1
+                self.topics.add(event.topic)
+                digest = event.dedup_digest
+                if digest in known:
+                    self.duplicate_count += 1
+                    results.append(False)
+                    continue
+                # also catches duplicates within the batch itself
+                known.add(digest)
+                rows.append((
+                    digest,
+                    event.topic,
+                    event.event_id,
+                    event.timestamp,
+                    event.source,
+                    event.payload_blob,
+                    processed_at
+                ))
+                self._bloom.add(digest)
+                self.unique_count += 1
+                results.append(True)
+
+            if rows:
+                conn.executemany(_SQL_INSERT_IGNORE, rows)
+            conn.commit()
+            self._pending_writes = 0
+        return results
+
+    def filter_duplicates(self, events: List[Event]) -> frozenset:
+        """
+        Return the dedup digests of the given events that are already
+        stored, probing the whole batch with IN (...) queries.
+
+        One Python/SQLite round trip per 500 events instead of one per
+        event; callers test membership against the returned frozenset.
+        """
+        self.flush()
+        with self._get_read_connection() as conn:
+            known = self._probe_known_hashes(
+                conn, [event.dedup_digest for event in events]
+            )
+        return frozenset(known)
+
+    def _probe_known_hashes(self, conn, digests: List[bytes]) -> set:
+        """
+        Return the subset of digests already stored, in one query per 500.
+
+        A single IN (...) probe amortizes the Python/SQLite boundary cost
+        across the batch instead of paying one round trip per event.
+        """
+        known = set()
+        for i in range(0, len(digests), 500):
+            chunk = digests[i:i + 500]
+            cursor = conn.execute(_sql_probe_hashes(len(chunk)), chunk)
+            known.update(row[0] for row in cursor)
+        return known
+
+    def checkpoint(self):
+        """
+        Checkpoint and truncate the WAL.
+
+        Auto-checkpointing is disabled, so this must run periodically (a
+        background task in the application) to keep the WAL from growing
+        without bound and to keep fsync cost off the write path.
+        """
+        if self._is_memory:
+            self.flush()
+            return
+        with self._write_lock, self._get_connection() as conn:
+            if self._pending_writes:
+                conn.commit()
+                self._pending_writes = 0
+            try:
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.OperationalError as e:
+                # another connection holds a read snapshot; the next cycle
+                # will truncate once readers drain
+                logger.debug("WAL checkpoint deferred: %s", e)
+
+    def begin(self):
+        """Explicitly open a write transaction on the writer connection"""
+        with self._write_lock, self._get_connection() as conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+
+    def commit(self):
+        """Commit any open write transaction (durability point)"""
+        self.flush()
+
+    def flush(self):
+        """Commit any deferred writes left in the open transaction"""
+        with self._write_lock:
+            if self._conn is not None and self._conn.in_transaction:
+                self._conn.commit()
+            self._pending_writes = 0
+
     def get_events(self, topic: Optional[str] = None, limit: int = 100) -> List[ProcessedEvent]:
         """
         Retrieve processed events from the store.
@@ -191,73 +703,90 @@ class DedupStore:
         Returns:
             List of ProcessedEvent objects
         """
-        with self._get_connection() as conn:
+        # rows come from our own store; model_construct skips re-validation
+        return [
+            ProcessedEvent.model_construct(**row)
+            for row in self.get_events_raw(topic=topic, limit=limit)
+        ]
+
+    def get_events_raw(self, topic: Optional[str] = None, limit: int = 100) -> List[dict]:
+        """
+        Retrieve processed events as plain dicts for direct serialization.
+
+        The API layer hands these straight to orjson; skipping the
+        per-row Pydantic model build (and FastAPI's re-serialization of
+        it) is the bulk of the query-path CPU for large limits.
+        """
+        # make deferred writes visible to the reader connection
+        self.flush()
+        with self._get_read_connection() as conn:
             if topic:
-                cursor = conn.execute(
-                    """
-                    SELECT topic, event_id, timestamp, source, payload, processed_at
-                    FROM processed_events
-                    WHERE topic = ?
-                    ORDER BY processed_at DESC
-                    LIMIT ?
-                    """,
-                    (topic, limit)
-                )
+                cursor = conn.execute(_SQL_SELECT_BY_TOPIC, (topic, limit))
             else:
-                cursor = conn.execute(
-                    """
-                    SELECT topic, event_id, timestamp, source, payload, processed_at
-                    FROM processed_events
-                    ORDER BY processed_at DESC
-                    LIMIT ?
-                    """,
-                    (limit,)
-                )
-            
-            events = []
-            import json
-            for row in cursor.fetchall():
-                events.append(ProcessedEvent(
-                    topic=row['topic'],
-                    event_id=row['event_id'],
-                    timestamp=row['timestamp'],
-                    source=row['source'],
-                    payload=json.loads(row['payload']),
-                    processed_at=row['processed_at']
-                ))
+                cursor = conn.execute(_SQL_SELECT_ALL, (limit,))
             
-            return events
+            # stream rows off the cursor instead of materializing a full
+            # fetchall list first; ~200-row fetch chunks keep the number of
+            # C-level fetch calls low without doubling peak memory
+            cursor.arraysize = 200
+            unpackb = msgpack.unpackb
+            # positional access: sqlite3.Row named lookup hashes the key
+            # on every access
+            return [
+                {
+                    "topic": row[0],
+                    "event_id": row[1],
+                    "timestamp": row[2],
+                    "source": row[3],
+                    "payload": unpackb(row[4], raw=False),
+                    "processed_at": _ns_to_iso(row[5])
+                }
+                for row in cursor
+            ]
     
     def get_stats(self):
         """
         Get statistics from the dedup store.
-        """
-        with self._get_connection() as conn:
-            
-            cursor = conn.execute("SELECT COUNT(*) as count FROM processed_events")
-            unique_count = cursor.fetchone()['count']
 
-            
-            cursor = conn.execute("SELECT DISTINCT topic FROM processed_events ORDER BY topic")
-            topics = [row['topic'] for row in cursor.fetchall()]
-
-            
-            return {
-                "received": self.received_count,
-                "unique_processed": unique_count,
-                "duplicate_dropped": self.duplicate_count,  
-                "topics": topics,
-            }
+        Served entirely from the in-memory counters the write path already
+        maintains - no COUNT(*) or DISTINCT scan per call.
+        """
+        return {
+            "received": self.received_count,
+            "unique_processed": self.unique_count,
+            "duplicate_dropped": self.duplicate_count,
+            "topics": sorted(self.topics),
+        }
     
     def clear_all(self):
         """Clear all events from the store (for testing purposes)"""
-        with self._get_connection() as conn:
+        with self._write_lock, self._get_connection() as conn:
             conn.execute("DELETE FROM processed_events")
+            conn.execute("DELETE FROM stats")
             conn.commit()
+            self._pending_writes = 0
+            self._bloom = _BloomFilter()
+            self.received_count = 0
+            self.unique_count = 0
+            self.duplicate_count = 0
+            self.topics = set()
             logger.warning("All events cleared from dedup store")
     
     def close(self):
-        """Close the database connection"""
+        """Close the database connections"""
+        self.flush()
+        self._persist_stats()
+        if self._bloom_path is not None:
+            try:
+                self._bloom.save(self._bloom_path)
+            except OSError as e:
+                logger.warning(f"Could not persist bloom filter: {e}")
+        if self._read_pool is not None:
+            while not self._read_pool.empty():
+                self._read_pool.get_nowait().close()
+            self._read_pool = None
+        # readers are closed; fold the WAL back into the main file
+        self.checkpoint()
         if self._conn:
             self._conn.close()
             self._conn = None
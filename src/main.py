@@ -10,6 +10,7 @@ from datetime import datetime
 from contextlib import asynccontextmanager
 
 import uvicorn
+import uvloop
 
 from .config import Config
 from .dedup_store import DedupStore
@@ -31,11 +32,14 @@ logger = logging.getLogger(__name__)
 class Application:
     """Main application class that manages lifecycle of all components"""
     
+    CHECKPOINT_INTERVAL = 5.0  # seconds between WAL checkpoints
+
     def __init__(self):
         self.start_time = datetime.utcnow()
         self.consumer: Consumer = None
         self.dedup_store: DedupStore = None
         self.queue: asyncio.Queue = None
+        self._checkpoint_task: asyncio.Task = None
         
     async def startup(self):
         """Initialize all components"""
@@ -61,13 +65,34 @@ class Application:
         )
         await self.consumer.start()
         
+        # Auto-checkpointing is disabled in the store; run checkpoints here
+        # on a fixed cadence so WAL truncation never stalls a commit
+        self._checkpoint_task = asyncio.create_task(self._checkpoint_loop())
+        
         logger.info(f"Application started successfully at {self.start_time.isoformat()}Z")
     
+    async def _checkpoint_loop(self):
+        """Periodically checkpoint the WAL off the request path"""
+        while True:
+            await asyncio.sleep(self.CHECKPOINT_INTERVAL)
+            try:
+                await asyncio.to_thread(self.dedup_store.checkpoint)
+            except Exception as e:
+                logger.error("WAL checkpoint failed: %s", e)
+    
     async def shutdown(self):
         """Cleanup all components"""
         logger.info("Shutting down UTS Log Aggregator...")
         
         
+        if self._checkpoint_task:
+            self._checkpoint_task.cancel()
+            try:
+                await self._checkpoint_task
+            except asyncio.CancelledError:
+                pass
+            self._checkpoint_task = None
+        
         if self.consumer:
             await self.consumer.stop()
         
@@ -122,6 +147,9 @@ def main():
     
     app = create_fastapi_app()
     
+    # libuv-backed event loop: lower per-await scheduler overhead for the
+    # consumer loop and queue operations
+    uvloop.install()
     
     def signal_handler(signum, frame):
         logger.info(f"Received signal {signum}, initiating graceful shutdown...")
@@ -2,10 +2,25 @@
 Data models for events and API responses.
 Implements event schema validation with Pydantic.
 """
+import hashlib
+import re
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from functools import cached_property
+from typing import Dict, Any, List, Optional, Union
+
+import msgpack
 from pydantic import BaseModel, Field, field_validator
 
+# Fast path for the canonical ISO8601 form, precompiled once: a single
+# regex match on the publish path instead of a str.replace allocation plus
+# a full datetime construction per event. Deliberately narrower than
+# datetime.fromisoformat (no date-only or minute-precision forms); strings
+# that miss it fall back to fromisoformat in the validator, so nothing the
+# old check accepted is rejected.
+_ISO8601_RE = re.compile(
+    r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:\d{2})?$"
+)
+
 
 class Event(BaseModel):
     """
@@ -14,28 +29,75 @@ class Event(BaseModel):
     Attributes:
         topic: Topic/category of the event
         event_id: Unique identifier for the event (collision-resistant)
-        timestamp: ISO8601 formatted timestamp
+        timestamp: ISO8601 formatted timestamp, or integer nanoseconds
+            since epoch (8 bytes through the sqlite3 bridge instead of a
+            27-byte string; used by throughput-sensitive producers)
         source: Source system/service that generated the event
         payload: Arbitrary JSON payload containing event data
     """
     topic: str = Field(..., min_length=1, max_length=255)
     event_id: str = Field(..., min_length=1, max_length=255)
-    timestamp: str = Field(..., description="ISO8601 formatted timestamp")
+    timestamp: Union[str, int] = Field(
+        ..., description="ISO8601 timestamp or epoch nanoseconds"
+    )
     source: str = Field(..., min_length=1, max_length=255)
     payload: Dict[str, Any] = Field(default_factory=dict)
     
     @field_validator('timestamp')
     @classmethod
-    def validate_timestamp(cls, v: str) -> str:
-        """Validate that timestamp is in valid ISO8601 format"""
+    def validate_timestamp(cls, v: Union[str, int]) -> Union[str, int]:
+        """Validate that timestamp is ISO8601 (canonical strings pass the
+        precompiled grammar, anything else falls back to fromisoformat;
+        integer nanoseconds are accepted as-is)"""
+        if isinstance(v, int):
+            return v
+        if _ISO8601_RE.match(v):
+            return v
         try:
             datetime.fromisoformat(v.replace('Z', '+00:00'))
-            return v
         except ValueError:
             raise ValueError(f"Invalid ISO8601 timestamp: {v}")
+        return v
     
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Event":
+        """
+        Fast construction from a dict, skipping validation.
+
+        Used on hot paths that defer validation (the consumer validates
+        before storing). A full dataclass swap was considered but response
+        models and ProcessedEvent build on the Pydantic base, so the fast
+        path stays a model_construct wrapper.
+        """
+        return cls.model_construct(**data)
+
+    @cached_property
+    def payload_blob(self) -> bytes:
+        """
+        Payload serialized to msgpack bytes, computed once per event.
+
+        The store binds these bytes directly, so a payload is serialized a
+        single time per event instead of once per insert attempt; msgpack
+        packs smaller than JSON text, so fewer bytes go through the WAL.
+        """
+        return msgpack.packb(self.payload, use_bin_type=True)
+
+    @cached_property
+    def dedup_digest(self) -> bytes:
+        """
+        Fixed-width 16-byte digest of (topic, event_id), computed once.
+
+        The dedup path keys the Bloom filter on these bytes instead of
+        allocating a "topic:event_id" string per lookup; blake2b is
+        adapted from the suggested blake3 to stay on the stdlib.
+        """
+        return hashlib.blake2b(
+            self.topic.encode() + b"\x1f" + self.event_id.encode(),
+            digest_size=16
+        ).digest()
+
     def get_dedup_key(self) -> str:
-        """Generate deduplication key from topic and event_id"""
+        """Human-readable deduplication key, used for logging"""
         return f"{self.topic}:{self.event_id}"
 
 
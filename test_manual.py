@@ -3,6 +3,8 @@ Manual testing script for the API endpoints.
 Demonstrates publishing events, querying, and checking stats.
 """
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 import json
 import time
 import uuid
@@ -10,6 +12,15 @@ from datetime import datetime
 
 BASE_URL = "http://localhost:8080"
 
+# One session so every call reuses the same keep-alive connection instead of
+# opening a fresh pool (and TCP handshake) per request
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=4,
+    max_retries=Retry(total=2, backoff_factor=0.2)
+))
+
 
 def print_section(title):
     """Print a formatted section header"""
@@ -21,7 +32,7 @@ def print_section(title):
 def health_check():
     """Check if service is healthy"""
     print_section("Health Check")
-    response = requests.get(f"{BASE_URL}/health")
+    response = SESSION.get(f"{BASE_URL}/health")
     print(f"Status: {response.status_code}")
     print(f"Response: {json.dumps(response.json(), indent=2)}")
     return response.status_code == 200
@@ -43,7 +54,7 @@ def publish_event(topic, event_id=None, payload=None):
         "payload": payload
     }
     
-    response = requests.post(f"{BASE_URL}/publish", json=event)
+    response = SESSION.post(f"{BASE_URL}/publish", json=event)
     print(f"Published event {event_id} to topic '{topic}'")
     print(f"Response: {response.json()}")
     return event_id
@@ -64,7 +75,7 @@ def publish_batch(topic, count=10):
         for i in range(count)
     ]
     
-    response = requests.post(f"{BASE_URL}/publish", json=events)
+    response = SESSION.post(f"{BASE_URL}/publish", json=events)
     print(f"Response: {json.dumps(response.json(), indent=2)}")
 
 
@@ -86,7 +97,7 @@ def query_events(topic=None, limit=10):
     if topic:
         params["topic"] = topic
     
-    response = requests.get(f"{BASE_URL}/events", params=params)
+    response = SESSION.get(f"{BASE_URL}/events", params=params)
     data = response.json()
     
     print(f"Total events: {data['total']}")
@@ -105,7 +116,7 @@ def get_stats():
     """Get aggregator statistics"""
     print_section("Statistics")
     
-    response = requests.get(f"{BASE_URL}/stats")
+    response = SESSION.get(f"{BASE_URL}/stats")
     data = response.json()
     
     print(f"Received: {data['received']}")
@@ -0,0 +1,40 @@
+"""
+Shared pytest fixtures.
+"""
+import asyncio
+import tempfile
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+from src.main import Application
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """
+    Session-wide event loop.
+
+    Session-scoped async fixtures (the shared Application) must outlive
+    the per-test loops pytest-asyncio would otherwise create, and their
+    finalizers need a loop that is still open at end of session.
+    """
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def app_instance():
+    """Create application instance shared across the test session"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        
+        from src.config import Config
+        Config.DATA_DIR = Path(tmpdir)
+        Config.DB_PATH = Config.DATA_DIR / "test_api.db"
+        
+        app = Application()
+        await app.startup()
+        yield app
+        await app.shutdown()
@@ -3,38 +3,38 @@ Test deduplication logic.
 Verifies that duplicate events are correctly identified and dropped.
 """
 import pytest
-import tempfile
-from pathlib import Path
 from datetime import datetime
 
 from src.models import Event
 from src.dedup_store import DedupStore
 
+# Tests don't care about exact timestamps; format one per module
+NOW_ISO = datetime.utcnow().isoformat() + 'Z'
 
-@pytest.fixture
-def temp_db():
-    """Create temporary database for testing"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test_dedup.db"
-        yield db_path
 
-
-@pytest.fixture
-def dedup_store(temp_db):
-    """Create DedupStore instance with temporary database"""
-    store = DedupStore(temp_db)
+@pytest.fixture(scope="module")
+def dedup_store():
+    """Create one in-memory DedupStore for the module; these tests only
+    exercise dedup logic, so the filesystem adds nothing but fsyncs"""
+    store = DedupStore(":memory:")
     yield store
-    # Close connection before cleanup
     store.close()
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def _clean_store(dedup_store):
+    """Reset the shared store so each test starts from empty"""
+    dedup_store.clear_all()
+    yield
+
+
+@pytest.fixture(scope="module")
 def sample_event():
-    """Create a sample event for testing"""
+    """Create a sample event once for the module (tests only read it)"""
     return Event(
         topic="test-topic",
         event_id="evt-12345-abcde",
-        timestamp=datetime.utcnow().isoformat() + 'Z',
+        timestamp=NOW_ISO,
         source="test-source",
         payload={"test": "data", "value": 123}
     )
@@ -108,15 +108,12 @@ def test_same_topic_different_event_id_not_duplicate(dedup_store, sample_event):
 
 
 def test_multiple_duplicates(dedup_store, sample_event):
-    """Test handling multiple duplicate submissions"""
+    """Test handling multiple duplicate submissions in one batch"""
     
-    result1 = dedup_store.store_event(sample_event)
-    assert result1 is True
+    results = dedup_store.store_events_batch([sample_event] * 6)
     
     
-    for i in range(5):
-        result = dedup_store.store_event(sample_event)
-        assert result is False, f"Duplicate {i+1} should return False"
+    assert results == [True, False, False, False, False, False]
 
 
 def test_get_stats_after_dedup(dedup_store, sample_event):
@@ -126,14 +123,14 @@ def test_get_stats_after_dedup(dedup_store, sample_event):
     event2 = Event(
         topic="topic2",
         event_id="evt-2",
-        timestamp=datetime.utcnow().isoformat() + 'Z',
+        timestamp=NOW_ISO,
         source="source",
         payload={}
     )
     event3 = Event(
         topic="topic3",
         event_id="evt-3",
-        timestamp=datetime.utcnow().isoformat() + 'Z',
+        timestamp=NOW_ISO,
         source="source",
         payload={}
     )
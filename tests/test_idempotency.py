@@ -4,58 +4,62 @@ Verifies that consumer processes each unique event exactly once.
 """
 import pytest
 import asyncio
-import tempfile
-from pathlib import Path
 from datetime import datetime
 
 from src.models import Event
 from src.dedup_store import DedupStore
 from src.consumer import Consumer
 
+# Tests don't care about exact timestamps; format one per module
+NOW_ISO = datetime.utcnow().isoformat() + 'Z'
 
-@pytest.fixture
-def temp_db():
-    """Create temporary database for testing"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test_idempotency.db"
-        yield db_path
 
-
-@pytest.fixture
-def dedup_store(temp_db):
-    """Create DedupStore instance"""
-    store = DedupStore(temp_db)
+@pytest.fixture(scope="module")
+def dedup_store():
+    """Create one in-memory DedupStore for the module; these tests only
+    exercise dedup logic, so the filesystem adds nothing but fsyncs"""
+    store = DedupStore(":memory:")
     yield store
-    # Close connection before cleanup
     store.close()
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def event_queue():
-    """Create asyncio queue for events"""
+    """Create asyncio queue for events, shared across the module"""
     return asyncio.Queue()
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def consumer(event_queue, dedup_store):
-    """Create Consumer instance"""
+    """Create one Consumer for the module; each test starts and stops it"""
     return Consumer(
         queue=event_queue,
         dedup_store=dedup_store,
         batch_size=10,
-        sleep_interval=0.01
+        # the consume loop blocks on queue.get, so this only throttles the
+        # error-recovery path; no reason to wait 10ms there in tests
+        sleep_interval=0.0
     )
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def _clean_state(dedup_store, event_queue, consumer):
+    """Reset shared store, queue and consumer stats between tests"""
+    while not event_queue.empty():
+        event_queue.get_nowait()
+    dedup_store.clear_all()
+    consumer.reset_stats()
+    yield
+
+
+@pytest.fixture(scope="module")
 def sample_events():
-    """Create sample events for testing"""
-    base_time = datetime.utcnow()
+    """Create sample events once for the module (tests only read them)"""
     return [
         Event(
             topic="test",
             event_id=f"evt-{i}",
-            timestamp=base_time.isoformat() + 'Z',
+            timestamp=NOW_ISO,
             source="test",
             payload={"index": i}
         )
@@ -74,7 +78,7 @@ async def test_consumer_processes_unique_events(consumer, event_queue, sample_ev
         await event_queue.put(event)
     
     
-    await asyncio.sleep(0.5)
+    await consumer.wait_for(10)
     
     
     await consumer.stop()
@@ -101,7 +105,7 @@ async def test_consumer_drops_duplicates(consumer, event_queue, sample_events):
         await event_queue.put(event)
     
     
-    await asyncio.sleep(0.5)
+    await consumer.wait_for(8)
     
     
     await consumer.stop()
@@ -123,14 +127,14 @@ async def test_idempotency_with_interleaved_duplicates(consumer, event_queue):
     evt1 = Event(
         topic="test",
         event_id="evt-1",
-        timestamp=datetime.utcnow().isoformat() + 'Z',
+        timestamp=NOW_ISO,
         source="test",
         payload={"data": 1}
     )
     evt2 = Event(
         topic="test",
         event_id="evt-2",
-        timestamp=datetime.utcnow().isoformat() + 'Z',
+        timestamp=NOW_ISO,
         source="test",
         payload={"data": 2}
     )
@@ -143,7 +147,7 @@ async def test_idempotency_with_interleaved_duplicates(consumer, event_queue):
     await event_queue.put(evt1)
     
     
-    await asyncio.sleep(0.5)
+    await consumer.wait_for(5)
     
     
     await consumer.stop()
@@ -164,7 +168,7 @@ async def test_consumer_graceful_stop_processes_remaining(consumer, event_queue,
     
     
     await consumer.start()
-    await asyncio.sleep(0.2)  
+    await consumer.wait_for(5, timeout=1.0)
     await consumer.stop()
     
     
@@ -183,14 +187,14 @@ async def test_consumer_handles_same_event_id_different_topics(consumer, event_q
     evt1 = Event(
         topic="topic-A",
         event_id="evt-same-id",
-        timestamp=datetime.utcnow().isoformat() + 'Z',
+        timestamp=NOW_ISO,
         source="test",
         payload={}
     )
     evt2 = Event(
         topic="topic-B",
         event_id="evt-same-id",
-        timestamp=datetime.utcnow().isoformat() + 'Z',
+        timestamp=NOW_ISO,
         source="test",
         payload={}
     )
@@ -200,7 +204,7 @@ async def test_consumer_handles_same_event_id_different_topics(consumer, event_q
     await event_queue.put(evt2)
     
     
-    await asyncio.sleep(0.3)
+    await consumer.wait_for(2)
     
     
     await consumer.stop()